@@ -0,0 +1,72 @@
+import asyncio
+import os
+import re
+import time
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# index.py builds its API clients at import time
+os.environ.setdefault("OPENAI_API_KEY", "unused")
+
+from index import extract_title, generate_llm_title, STOP_WORDS, TITLE_CONFIDENCE_THRESHOLD
+
+# Sample voice-note transcripts spanning the domains the app is tuned for
+SAMPLE_CORPUS = [
+    "So the pricing review. I think our pricing is too complex, customers keep asking which pricing tier they need, and the sales team spends half the call explaining pricing instead of selling. We should collapse the tiers to two and publish pricing on the site.",
+    "Kitchen staffing is the problem this week. Two line cooks quit, the kitchen is running short every Friday, and table turns dropped. I want to cross-train the prep team so the kitchen can cover weekends, and maybe trim the menu until staffing recovers.",
+    "Quick thought on the enterprise pipeline. The pipeline looks healthy on paper but half the enterprise deals have been stuck in legal for a month. We need a standard contract, and someone owning legal review so enterprise deals stop stalling at the finish line.",
+    "Patient onboarding is taking forever. New patient intake is paper based, the front desk re-types everything, and patients wait forty minutes. Digital intake forms before the appointment would cut the patient wait and free the front desk.",
+    "Reflecting on the board meeting. The board wants faster growth but the cash runway is eleven months. Growth at this burn rate means raising again in six months. I'd rather show the board a plan that extends runway and grows efficiently.",
+    "Curriculum planning for next term. Students are struggling with the statistics unit, grades dropped again, and teachers say the statistics material is too abstract. Let's rebuild the statistics unit around real datasets students care about.",
+    "Portfolio check in. Equity exposure is too high given where rates are, and the portfolio has drifted from the target allocation. Rebalance the portfolio toward bonds this quarter and set a rule to rebalance whenever equity drifts five points.",
+    "Hiring. We keep losing senior engineering candidates at the offer stage. The offer process takes three weeks and competitors close in one. Engineering managers need authority to make offers within forty eight hours.",
+]
+
+def keywords(title: str) -> set:
+    words = re.sub(r"[^a-z\s]", "", title.lower()).split()
+    return {word for word in words if len(word) > 3 and word not in STOP_WORDS}
+
+def overlap(a: str, b: str) -> float:
+    a_words, b_words = keywords(a), keywords(b)
+    if not a_words or not b_words:
+        return 0.0
+    return len(a_words & b_words) / len(a_words | b_words)
+
+print("--- TITLE ENGINE COMPARISON: LOCAL vs CLAUDE ---")
+
+has_llm = bool(os.environ.get("ANTHROPIC_API_KEY"))
+if not has_llm:
+    print("ANTHROPIC_API_KEY not set: reporting the local engine only.\n")
+
+local_ms, llm_ms, overlaps, served_overlaps, confident = [], [], [], [], 0
+
+for transcript in SAMPLE_CORPUS:
+    started = time.perf_counter()
+    for _ in range(100):
+        title, confidence = extract_title(transcript)
+    local_ms.append((time.perf_counter() - started) * 1000 / 100)
+    served_locally = bool(title) and confidence >= TITLE_CONFIDENCE_THRESHOLD
+    confident += served_locally
+
+    line = f"[{confidence:.2f}] {title or '-'}{'  (served locally)' if served_locally else ''}"
+    if has_llm:
+        try:
+            started = time.perf_counter()
+            llm_title = asyncio.run(generate_llm_title(transcript))
+            llm_ms.append((time.perf_counter() - started) * 1000)
+            overlaps.append(overlap(title, llm_title))
+            if served_locally:
+                served_overlaps.append(overlaps[-1])
+            line += f"  |  Claude: {llm_title}  (overlap {overlaps[-1]:.2f})"
+        except Exception as e:
+            line += f"  |  Claude failed: {str(e)}"
+    print(line)
+
+print(f"\nLocal engine: avg {sum(local_ms) / len(local_ms) * 1000:.0f} µs, max {max(local_ms) * 1000:.0f} µs per title")
+print(f"Served locally at threshold {TITLE_CONFIDENCE_THRESHOLD}: {confident}/{len(SAMPLE_CORPUS)}")
+if llm_ms:
+    print(f"Claude: avg {sum(llm_ms) / len(llm_ms):.0f} ms, max {max(llm_ms):.0f} ms per title")
+    print(f"Keyword overlap with Claude titles (Jaccard): avg {sum(overlaps) / len(overlaps):.2f} over all notes")
+    if served_overlaps:
+        print(f"Keyword overlap on titles served locally: avg {sum(served_overlaps) / len(served_overlaps):.2f}")
@@ -1,15 +1,21 @@
-from fastapi import FastAPI, UploadFile, File, HTTPException, Form
+from fastapi import FastAPI, UploadFile, File, HTTPException, Form, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
-from pydantic import BaseModel
+from pydantic import BaseModel, Field, ValidationError, create_model
 from anthropic import Anthropic
 from openai import OpenAI
 import os
 import io
+import asyncio
 import logging
 import json
 import re
 import base64
-from typing import Literal, List
+import time
+from functools import partial
+from contextvars import ContextVar
+from collections import Counter, defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Literal, List, Optional, Tuple, get_args
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -93,74 +99,602 @@ class GenerateRequest(BaseModel):
     emphasis_signals: List[str] = []
     executive_state: str = None
     structure_mode: Literal["Detailed", "Brief"] = "Detailed"
+    background: bool = False
 
 class TitleRequest(BaseModel):
     transcript: str
+    use_llm: bool = False
+
+# Response Schemas for Post Generation (one per mode/structure_mode combination)
+class StrategicPillar(BaseModel):
+    title: str = Field(min_length=1)
+    description: str = Field(min_length=1, description="1-2 sentences of COS analysis")
+    is_expanded: bool = Field(False, description="true if developed beyond what was explicitly stated in the input")
+    has_statistics: bool = Field(False, description="true if contains any specific numbers, figures, or statistics")
+
+class ScribeBriefResponse(BaseModel):
+    core_thesis: str = Field(min_length=1, description="30-60 word strategic thesis statement")
+    strategic_pillars: List[StrategicPillar] = Field(min_length=1)
+    has_numerical_claims: bool = Field(description="true if the entire output contains any statistics, figures, or numbers")
+
+class ScribeDetailedResponse(ScribeBriefResponse):
+    tactical_steps: List[str] = Field(min_length=1, description="actionable strings")
+
+class StrategistBriefResponse(BaseModel):
+    judgment: str = Field(min_length=1, description="150-250 words of deep strategic judgment")
+    has_numerical_claims: bool = Field(description="true if the entire output contains any statistics, figures, or numbers")
+
+class StrategistDetailedResponse(StrategistBriefResponse):
+    riskAudit: str = Field(min_length=1, description="150-250 words of risk analysis")
+    emailDraft: str = Field(min_length=1, description="A ready-to-send draft starting with 'SUBJECT: '")
+
+RESPONSE_SCHEMAS = {
+    ("scribe", "Brief"): ScribeBriefResponse,
+    ("scribe", "Detailed"): ScribeDetailedResponse,
+    ("strategist", "Brief"): StrategistBriefResponse,
+    ("strategist", "Detailed"): StrategistDetailedResponse,
+}
+
+# How many targeted repair rounds to attempt before giving up on a response
+MAX_REPAIR_ATTEMPTS = 2
+
+# In-memory metrics (per warm instance)
+METRIC_WINDOW = 500
+LATENCIES = defaultdict(lambda: deque(maxlen=METRIC_WINDOW))
+COUNTERS = defaultdict(int)
+
+def record_latency(name: str, started: float) -> float:
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    LATENCIES[name].append(elapsed_ms)
+    return elapsed_ms
+
+def increment(name: str, by: int = 1):
+    COUNTERS[name] += by
+
+def summarize_latency(name: str) -> dict:
+    samples = sorted(LATENCIES.get(name, []))
+    if not samples:
+        return {"count": 0}
+    return {
+        "count": len(samples),
+        "avg_ms": round(sum(samples) / len(samples), 2),
+        "p50_ms": round(samples[len(samples) // 2], 2),
+        "p95_ms": round(samples[min(len(samples) - 1, int(len(samples) * 0.95))], 2),
+    }
+
+def generation_metrics() -> dict:
+    total = COUNTERS["generation.requests"]
+    repaired = COUNTERS["generation.repaired"]
+    initial = summarize_latency("generation.initial")
+    repair = summarize_latency("generation.repair")
+    metrics = {
+        "requests": total,
+        "valid_first_pass": COUNTERS["generation.valid_first_pass"],
+        "repaired": repaired,
+        "repair_failed": COUNTERS["generation.repair_failed"],
+        "repair_calls": COUNTERS["generation.repair_calls"],
+        "repair_rate": round(repaired / total, 4) if total else 0.0,
+        "initial_latency": initial,
+        "repair_latency": repair,
+    }
+    # Savings: a targeted repair call versus the full regeneration the user would otherwise trigger
+    if initial["count"] and repair["count"]:
+        metrics["estimated_ms_saved_per_repair"] = round(initial["avg_ms"] - repair["avg_ms"], 2)
+    return metrics
+
+# --- UPSTREAM SCHEDULER: Weighted fair queuing of Anthropic/OpenAI calls by priority class ---
+UPSTREAM_CONCURRENCY = 8
+# Priority class -> (weight, max share of UPSTREAM_CONCURRENCY)
+PRIORITY_CLASSES = {
+    "interactive_pro": (8, 1.0),
+    "interactive_free": (4, 0.75),
+    "title": (2, 0.25),
+    "background": (1, 0.25),
+}
+# A request queued longer than this is admitted ahead of weighted order
+STARVATION_SECONDS = 10.0
+
+# Priority class for upstream calls made from the current request
+UPSTREAM_PRIORITY = ContextVar("upstream_priority", default="background")
+
+class UpstreamTicket:
+    """One upstream call waiting for (or holding) a scheduler slot."""
+
+    def __init__(self, priority: str):
+        self.priority = priority
+        self.enqueued = time.perf_counter()
+        self.admitted = None
+
+class UpstreamScheduler:
+    """Admits upstream calls by weighted fair queuing across priority classes.
+
+    Each class gets a virtual clock that advances by 1/weight per admitted call; the backlogged
+    class with the lowest clock goes next, subject to its concurrency cap. Requests that have
+    waited STARVATION_SECONDS skip the weighted order so low classes always make progress.
+
+    Admission is awaited on the event loop before any worker thread is taken, so queued calls
+    never sit in a thread pool's first-in-first-out queue ahead of the scheduler.
+    """
+
+    def __init__(self, capacity: int, classes: dict):
+        self.capacity = capacity
+        self.weights = {name: weight for name, (weight, _) in classes.items()}
+        self.limits = {name: max(1, round(capacity * share)) for name, (_, share) in classes.items()}
+        self.queues = {name: deque() for name in classes}
+        self.active = {name: 0 for name in classes}
+        self.virtual_time = {name: 0.0 for name in classes}
+        self.clock = 0.0
+
+    def _next_class(self) -> Optional[Tuple[str, bool]]:
+        """Returns the class to admit next and whether it was picked by the starvation override."""
+        if sum(self.active.values()) >= self.capacity:
+            return None
+        for queue in self.queues.values():
+            # Drop waiters whose request was cancelled while queued
+            while queue and queue[0].admitted.done():
+                queue.popleft()
+        eligible = [name for name, queue in self.queues.items() if queue and self.active[name] < self.limits[name]]
+        if not eligible:
+            return None
+        now = time.perf_counter()
+        starved = [name for name in eligible if now - self.queues[name][0].enqueued >= STARVATION_SECONDS]
+        if starved:
+            return min(starved, key=lambda name: self.queues[name][0].enqueued), True
+        return min(eligible, key=lambda name: (self.virtual_time[name], -self.weights[name])), False
+
+    def _dispatch(self):
+        while (choice := self._next_class()) is not None:
+            priority, starved = choice
+            ticket = self.queues[priority].popleft()
+            if starved:
+                increment(f"scheduler.starvation_admits.{priority}")
+            self.clock = self.virtual_time[priority]
+            self.virtual_time[priority] += 1 / self.weights[priority]
+            self.active[priority] += 1
+            ticket.admitted.set_result(None)
+
+    def _enqueue(self, ticket: UpstreamTicket):
+        queue = self.queues[ticket.priority]
+        if not queue:
+            # An idle class resumes at the current clock instead of cashing in credit from idle time
+            self.virtual_time[ticket.priority] = max(self.virtual_time[ticket.priority], self.clock)
+        queue.append(ticket)
+
+    def promote(self, ticket: UpstreamTicket, priority: str):
+        """Moves a ticket that is still waiting into `priority`, e.g. when speculative work gains a waiting user."""
+        if priority not in self.queues or ticket.priority == priority:
+            return
+        if ticket.admitted is None:
+            ticket.priority = priority
+            return
+        if ticket.admitted.done():
+            return
+        self.queues[ticket.priority].remove(ticket)
+        ticket.priority = priority
+        self._enqueue(ticket)
+        increment(f"scheduler.promoted.{priority}")
+        self._dispatch()
+
+    def _release(self, ticket: UpstreamTicket):
+        self.active[ticket.priority] -= 1
+        self._dispatch()
+
+    async def _admit(self, priority: str, ticket: Optional[UpstreamTicket] = None) -> UpstreamTicket:
+        ticket = ticket or UpstreamTicket(priority)
+        if ticket.priority not in self.queues:
+            ticket.priority = "background"
+        ticket.admitted = asyncio.get_running_loop().create_future()
+        self._enqueue(ticket)
+        self._dispatch()
+        try:
+            await ticket.admitted
+        except asyncio.CancelledError:
+            if ticket.admitted.done() and not ticket.admitted.cancelled():
+                self._release(ticket)
+            raise
+
+        record_latency(f"scheduler.wait.{ticket.priority}", ticket.enqueued)
+        increment(f"scheduler.admitted.{ticket.priority}")
+        return ticket
+
+    def _finish(self, ticket: UpstreamTicket, future: asyncio.Future):
+        if not future.cancelled():
+            # Retrieve the outcome so a call whose caller went away doesn't log "exception never retrieved"
+            future.exception()
+        self._release(ticket)
+
+    async def run(self, executor: ThreadPoolExecutor, call, priority: str, ticket: Optional[UpstreamTicket] = None):
+        """Runs a blocking `call` on `executor` once admitted under `priority`.
+
+        The slot is released when the worker thread finishes, not when the caller stops waiting:
+        a cancelled caller leaves the thread running, and freeing its slot early would let the next
+        admitted call queue behind it inside the executor, outside the scheduler's view.
+        """
+        ticket = await self._admit(priority, ticket)
+        try:
+            future = asyncio.get_running_loop().run_in_executor(executor, call)
+        except BaseException:
+            self._release(ticket)
+            raise
+        future.add_done_callback(partial(self._finish, ticket))
+        return await asyncio.shield(future)
+
+    def metrics(self) -> dict:
+        return {
+            name: {
+                "weight": self.weights[name],
+                "limit": self.limits[name],
+                "queued": sum(1 for ticket in self.queues[name] if not ticket.admitted.done()),
+                "active": self.active[name],
+                "admitted": COUNTERS[f"scheduler.admitted.{name}"],
+                "starvation_admits": COUNTERS[f"scheduler.starvation_admits.{name}"],
+                "promoted_in": COUNTERS[f"scheduler.promoted.{name}"],
+                "queue_wait": summarize_latency(f"scheduler.wait.{name}"),
+            }
+            for name in self.queues
+        }
+
+scheduler = UpstreamScheduler(UPSTREAM_CONCURRENCY, PRIORITY_CLASSES)
+# Admitted calls run here; one thread per slot, so an admitted call never waits for a thread
+UPSTREAM_EXECUTOR = ThreadPoolExecutor(max_workers=UPSTREAM_CONCURRENCY, thread_name_prefix="upstream")
+
+async def run_upstream(func, *args, ticket: Optional[UpstreamTicket] = None, **kwargs):
+    """Waits for a scheduler slot under the current priority class, then runs the blocking call."""
+    return await scheduler.run(UPSTREAM_EXECUTOR, partial(func, *args, **kwargs), UPSTREAM_PRIORITY.get(), ticket)
+
+async def create_message(**kwargs):
+    """client.messages.create, admitted through the scheduler."""
+    return await run_upstream(client.messages.create, **kwargs)
 
 @app.get("/api/ping")
 def ping():
     return {"status": "pong"}
 
+@app.get("/api/metrics")
+def metrics_handler():
+    return {
+        "status": "success",
+        "generation": generation_metrics(),
+        "titles": {
+            "local": COUNTERS["title.local"],
+            "llm": COUNTERS["title.llm"],
+            "local_latency": summarize_latency("title.local"),
+            "llm_latency": summarize_latency("title.llm"),
+        },
+        "long_input": {
+            "chunks": COUNTERS["long_input.chunks"],
+            "resplits": COUNTERS["long_input.resplits"],
+            "map_latency": summarize_latency("long_input.map"),
+            "transmute_single_shot": summarize_latency("transmute.single_shot"),
+            "transmute_map_reduce": summarize_latency("transmute.map_reduce"),
+            "generate_single_shot": summarize_latency("generate.single_shot"),
+            "generate_map_reduce": summarize_latency("generate.map_reduce"),
+        },
+        "scheduler": scheduler.metrics(),
+        "streaming": {
+            "segments": COUNTERS["stream.segments"],
+            "segment_latency": summarize_latency("stream.segment"),
+            "after_stop_latency": summarize_latency("stream.after_stop"),
+        },
+    }
+
+# --- LOCAL TITLE ENGINE: Extractive keyphrase titles, Claude only when unsure ---
+# Ported from src/utils/textAnalysis.js so titles use the same notion of a keyword
+STOP_WORDS = {
+    "a", "an", "the", "and", "or", "but", "if", "then", "else", "when", "at", "from", "by", "for",
+    "with", "about", "against", "between", "into", "through", "during", "before", "after", "above", "below", "to", "up", "down",
+    "in", "out", "on", "off", "over", "under", "again", "further", "once", "here", "there", "all", "any", "both",
+    "each", "few", "more", "most", "other", "some", "such", "no", "nor", "not", "only", "own", "same", "so",
+    "than", "too", "very", "s", "t", "can", "will", "just", "don", "should", "now", "i", "me", "my",
+    "myself", "we", "our", "ours", "ourselves", "you", "your", "yours", "yourself", "yourselves", "he", "him", "his", "himself",
+    "she", "her", "hers", "herself", "it", "its", "itself", "they", "them", "their", "theirs", "themselves", "what", "which",
+    "who", "whom", "this", "that", "these", "those", "am", "is", "are", "was", "were", "be", "been", "being",
+    "have", "has", "had", "having", "do", "does", "did", "doing", "would", "could", "ought", "i'm", "you're", "he's",
+    "she's", "it's", "we're", "they're", "i've", "you've", "we've", "they've", "i'd", "you'd", "he'd", "she'd", "we'd", "they'd",
+    "i'll", "you'll", "he'll", "she'll", "we'll", "they'll", "isn't", "aren't", "wasn't", "weren't", "hasn't", "haven't", "hadn't", "doesn't",
+    "don't", "didn't", "won't", "wouldn't", "can't", "couldn't", "shouldn't", "mustn't", "needn't", "shan't", "mightn't", "let's", "that's", "who's",
+    "what's", "here's", "there's", "when's", "where's", "why's", "how's", "b", "c", "d", "e", "f", "g", "h",
+    "j", "k", "l", "m", "n", "o", "p", "q", "r", "u", "v", "w", "x", "y",
+    "z", "um", "uh", "like", "basically", "know", "right", "okay", "actually", "yeah", "yes", "well",
+}
+# Spoken filler that survives the stop-word list but never belongs in a title
+TITLE_FILLER_WORDS = {"think", "want", "need", "keep", "going", "gonna", "really", "thing", "things", "stuff", "maybe", "quick", "thought"}
+
+TITLE_SCAN_CHARS = 2000
+TITLE_MIN_WORDS = 2
+TITLE_MAX_WORDS = 5
+# Span score at which a local title is fully trusted (see extract_title)
+TITLE_STRONG_SCORE = 4
+# Minimum span confidence before the local title is trusted over Claude
+TITLE_CONFIDENCE_THRESHOLD = 0.5
+
+# Stop words allowed inside a title span; anything else breaks the phrase
+TITLE_CONNECTORS = {"a", "an", "the", "of", "for", "and", "to", "in", "on", "with"}
+
+def is_title_keyword(word: str) -> bool:
+    return len(word) > 3 and word not in STOP_WORDS and word not in TITLE_FILLER_WORDS
+
+def extract_title(transcript: str) -> tuple:
+    """Picks the strongest 2-5 word keyphrase of the transcript as its title. Returns (title, confidence).
+
+    Candidates are contiguous spans inside one sentence that start and end on a keyword and
+    contain no stop words other than TITLE_CONNECTORS. A span scores its repeat occurrences plus
+    the repeat occurrences of its keywords, with a bonus for the opening sentence, where voice
+    notes usually name their topic. Confidence is that score against TITLE_STRONG_SCORE.
+    """
+    text = (transcript or "")[:TITLE_SCAN_CHARS].lower()
+    sentences = [re.sub(r"[/#$%^&*{}=\-_`~\"]", "", fragment).split() for fragment in re.split(r"[.,!?;:()\n]+", text)]
+    sentences = [words for words in sentences if words]
+    frequency = Counter(word for words in sentences for word in words if is_title_keyword(word))
+
+    span_counts, opening_spans = Counter(), set()
+    for index, words in enumerate(sentences):
+        for start, first in enumerate(words):
+            if not is_title_keyword(first):
+                continue
+            for end in range(start + 1, min(start + TITLE_MAX_WORDS, len(words))):
+                word = words[end]
+                if not is_title_keyword(word) and word not in TITLE_CONNECTORS:
+                    break
+                if is_title_keyword(word) and end - start + 1 >= TITLE_MIN_WORDS:
+                    span = tuple(words[start:end + 1])
+                    span_counts[span] += 1
+                    if index == 0:
+                        opening_spans.add(span)
+
+    best_span, best_rank = None, None
+    for span, count in span_counts.items():
+        keywords = {word for word in span if is_title_keyword(word)}
+        score = (count - 1) + sum(frequency[word] - 1 for word in keywords) + (span in opening_spans)
+        # Prefer the higher score, then the shorter span; ties go to the earliest span
+        rank = (score, -len(span))
+        if best_rank is None or rank > best_rank:
+            best_span, best_rank = span, rank
+
+    if best_span is None:
+        return "", 0.0
+
+    confidence = min(1.0, best_rank[0] / TITLE_STRONG_SCORE)
+    title = " ".join(
+        word.capitalize() if index == 0 or is_title_keyword(word) else word
+        for index, word in enumerate(best_span)
+    )
+    return title, round(confidence, 2)
+
+async def generate_llm_title(transcript: str) -> str:
+    response = await create_message(
+        model=MODEL_ID,
+        max_tokens=30,
+        messages=[
+            {
+                "role": "user",
+                "content": f"Generate a concise 3 to 5 word title that summarizes this voice note transcript. Return ONLY the title text, nothing else. No quotes, no punctuation at the end.\n\nTranscript: \"\"\"\n{transcript[:500]}\n\"\"\""
+            }
+        ]
+    )
+    return response.content[0].text.strip().strip('"').strip("'")
+
 # --- GENERATE TITLE: Create a short 3-5 word summary title ---
 @app.post("/api/generate-title")
 async def generate_title_handler(request: TitleRequest):
+    UPSTREAM_PRIORITY.set("title")
+    started = time.perf_counter()
+    title, confidence = extract_title(request.transcript)
+    record_latency("title.local", started)
+
+    if title and confidence >= TITLE_CONFIDENCE_THRESHOLD and not request.use_llm:
+        increment("title.local")
+        return {"status": "success", "title": title, "source": "local"}
+
     try:
-        response = client.messages.create(
-            model=MODEL_ID,
-            max_tokens=30,
-            messages=[
-                {
-                    "role": "user",
-                    "content": f"Generate a concise 3 to 5 word title that summarizes this voice note transcript. Return ONLY the title text, nothing else. No quotes, no punctuation at the end.\n\nTranscript: \"\"\"\n{request.transcript[:500]}\n\"\"\""
-                }
-            ]
-        )
-        title = response.content[0].text.strip().strip('"').strip("'")
-        return {"status": "success", "title": title}
+        started = time.perf_counter()
+        llm_title = await generate_llm_title(request.transcript)
+        record_latency("title.llm", started)
+        increment("title.llm")
+        return {"status": "success", "title": llm_title, "source": "llm"}
     except Exception as e:
         logger.error(f"Title generation error: {str(e)}")
+        if title:
+            return {"status": "success", "title": title, "source": "local"}
         return {"status": "error", "title": "Voice Note"}
 
-# --- STEP 1: THE SCRIBE (Audio -> Core Thesis) ---
-@app.post("/api/transmute")
-async def transmute_handler(file: UploadFile = File(...), domain: str = Form("General Business")):
-    try:
-        logger.info(f"Scribe receiving audio: {file.filename}")
-        
-        # 1. READ AUDIO DATA
-        audio_bytes = await file.read()
-        mime_type = file.content_type or "audio/webm"
-        mime_type = mime_type.split(";")[0]
-        
-        # Map content types to file extensions for Whisper
-        ext_mapping = {
-            "audio/webm": "webm",
-            "audio/mpeg": "mp3",
-            "audio/mp3": "mp3",
-            "audio/wav": "wav",
-            "audio/mp4": "m4a",
-            "audio/x-m4a": "m4a",
-            "audio/ogg": "ogg",
-        }
-        file_ext = ext_mapping.get(mime_type, "webm")
-        
-        # 2. TRANSCRIBE with OpenAI Whisper
-        logger.info(f"Sending audio to Whisper ({mime_type}, {len(audio_bytes)} bytes)")
-        audio_file = io.BytesIO(audio_bytes)
-        audio_file.name = f"audio.{file_ext}"
-        
-        whisper_response = openai_client.audio.transcriptions.create(
-            model="whisper-1",
-            file=audio_file,
-            response_format="verbose_json",
-        )
-        
-        raw_transcription = whisper_response.text
-        detected_language = getattr(whisper_response, "language", "en")
-        logger.info(f"Whisper transcription complete. Language: {detected_language}, Length: {len(raw_transcription)} chars")
-        
-        # 3. ANALYZE with Claude (executive state + translation if needed)
-        analysis_prompt = f"""You are an elite Chief of Staff. You are analyzing this from a {domain} perspective. Analyze this transcription.
+# Map content types to file extensions for Whisper
+AUDIO_EXTENSIONS = {
+    "audio/webm": "webm",
+    "audio/mpeg": "mp3",
+    "audio/mp3": "mp3",
+    "audio/wav": "wav",
+    "audio/mp4": "m4a",
+    "audio/x-m4a": "m4a",
+    "audio/ogg": "ogg",
+}
+
+def whisper_transcribe(audio_bytes: bytes, file_ext: str) -> tuple:
+    """Transcribes one audio file with OpenAI Whisper. Returns (text, language)."""
+    audio_file = io.BytesIO(audio_bytes)
+    audio_file.name = f"audio.{file_ext}"
+
+    whisper_response = openai_client.audio.transcriptions.create(
+        model="whisper-1",
+        file=audio_file,
+        response_format="verbose_json",
+    )
+    return whisper_response.text, getattr(whisper_response, "language", "en")
+
+def local_transcribe(audio_bytes: bytes, file_ext: str) -> tuple:
+    """Offline stand-in for Whisper (TRANSCRIBER=local). Deterministic, so tests can assert on it."""
+    return f"[{len(audio_bytes)} bytes of {file_ext} audio]", "en"
+
+TRANSCRIBERS = {
+    "whisper": whisper_transcribe,
+    "local": local_transcribe,
+}
+
+def get_transcriber():
+    """Blocking transcriber for this deployment; call it through run_upstream."""
+    return TRANSCRIBERS.get(os.environ.get("TRANSCRIBER", "whisper"), whisper_transcribe)
+
+# --- LONG INPUT MODE: Map-reduce over transcripts too long for one call ---
+# Above this many characters, transcripts are chunked instead of sent inline in one call
+LONG_INPUT_CHARS = 12000
+LONG_INPUT_CHUNK_CHARS = 4000
+# Upper bound on concurrent map calls per request
+LONG_INPUT_CONCURRENCY = 4
+# Estimated output tokens above which a translation no longer fits safely in one 4096-token reply
+LONG_INPUT_TRANSLATION_TOKENS = 2000
+
+def is_english(language: str) -> bool:
+    return (language or "en").lower() in ("en", "english")
+
+def estimate_translation_tokens(text: str) -> int:
+    """Rough output-token cost of translating `text` to English: ~1 token per CJK/wide character, ~4 characters per token otherwise."""
+    wide = sum(1 for char in text if ord(char) >= 0x2E80)
+    return wide + (len(text) - wide) // 4
+
+def needs_long_input_mode(text: str, language: str = "en") -> bool:
+    if len(text) > LONG_INPUT_CHARS:
+        return True
+    return not is_english(language) and estimate_translation_tokens(text) > LONG_INPUT_TRANSLATION_TOKENS
+
+def split_transcript(text: str, budget: int = LONG_INPUT_CHUNK_CHARS, measure=len) -> List[str]:
+    """Packs whole sentences into chunks whose `measure` (characters by default) stays within `budget`; only run-on sentences are split on words."""
+    pieces = []
+    for paragraph in re.split(r"\n{2,}", text.strip()):
+        # CJK full stops end a sentence without trailing whitespace
+        sentences = [sentence for sentence in re.split(r"(?<=[.!?])\s+|(?<=[。！？])\s*", paragraph.strip()) if sentence]
+        pieces.extend((index == 0, sentence) for index, sentence in enumerate(sentences))
+    chunks, current, cost = [], "", 0
+    for opens_paragraph, sentence in pieces:
+        while measure(sentence) > budget:
+            # Longest prefix within budget, then back off to the last word boundary
+            low, high = 1, len(sentence)
+            while low < high:
+                middle = (low + high + 1) // 2
+                low, high = (middle, high) if measure(sentence[:middle]) <= budget else (low, middle - 1)
+            cut = sentence.rfind(" ", 0, low)
+            cut = cut if cut > 0 else low
+            if current:
+                chunks.append(current)
+                current, cost = "", 0
+            chunks.append(sentence[:cut].strip())
+            sentence = sentence[cut:].strip()
+        if not current or current[-1] in "。！？" and not opens_paragraph:
+            separator = ""
+        else:
+            separator = "\n\n" if opens_paragraph else " "
+        sentence_cost = measure(sentence)
+        if current and cost + measure(separator) + sentence_cost > budget:
+            chunks.append(current)
+            current, cost, separator = "", 0, ""
+        current = f"{current}{separator}{sentence}"
+        cost += measure(separator) + sentence_cost
+    if current:
+        chunks.append(current)
+    return chunks
+
+class TruncatedOutputError(ValueError):
+    """Claude stopped at max_tokens, so the completion is missing its tail."""
+
+async def complete_text(prompt: str, max_tokens: int = 4096) -> str:
+    response = await create_message(
+        model=MODEL_ID,
+        max_tokens=max_tokens,
+        messages=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    )
+    if response.stop_reason == "max_tokens":
+        raise TruncatedOutputError(f"Completion hit max_tokens ({max_tokens})")
+    return response.content[0].text.strip()
+
+async def map_chunks(build_prompt, chunks: List[str], measure=len) -> List[str]:
+    """Runs one Claude call per chunk with bounded parallelism, preserving chunk order.
+
+    A chunk whose completion is cut off at max_tokens is re-split in half (by `measure`) and
+    mapped again, so a truncated reply is never joined into the result.
+    """
+    started = time.perf_counter()
+    limit = asyncio.Semaphore(LONG_INPUT_CONCURRENCY)
+
+    async def run(part: int, chunk: str) -> str:
+        async with limit:
+            try:
+                return await complete_text(build_prompt(part, len(chunks), chunk))
+            except TruncatedOutputError:
+                halves = split_transcript(chunk, max(1, measure(chunk) // 2), measure)
+                if len(halves) < 2:
+                    raise
+        # Re-split outside the semaphore so the halves can take their own permits
+        logger.warning(f"Chunk {part}/{len(chunks)} truncated: re-running as {len(halves)} pieces")
+        increment("long_input.resplits")
+        return " ".join(await asyncio.gather(*(run(part, half) for half in halves)))
+
+    results = await asyncio.gather(*(run(index + 1, chunk) for index, chunk in enumerate(chunks)))
+    record_latency("long_input.map", started)
+    increment("long_input.chunks", len(chunks))
+    return results
+
+def translate_chunk_prompt(part: int, total: int, chunk: str) -> str:
+    return f"""Translate part {part} of {total} of this voice note transcription into English.
+Translate everything faithfully. Do not summarize, add, or comment. Return ONLY the translation.
+
+Transcription part: \"\"\"
+{chunk}
+\"\"\""""
+
+def condense_chunk_prompt(part: int, total: int, chunk: str) -> str:
+    return f"""Condense part {part} of {total} of this voice note transcription into dense notes for a Chief of Staff.
+Keep every fact, figure, name, decision, risk, and action item, in the speaker's order. Drop filler and repetition.
+Return ONLY the notes.
+
+Transcription part: \"\"\"
+{chunk}
+\"\"\""""
+
+async def condense_long_input(text: str) -> str:
+    """Map step for generation: condenses each chunk concurrently so synthesis runs over the notes."""
+    chunks = split_transcript(text)
+    logger.info(f"Long input ({len(text)} chars): condensing {len(chunks)} chunks")
+    return "\n\n".join(await map_chunks(condense_chunk_prompt, chunks))
+
+async def analyze_long_transcription(raw_transcription: str, detected_language: str, domain: str) -> dict:
+    """Long-input variant of the analysis: translate chunks concurrently, then classify once."""
+    english = is_english(detected_language)
+    if english:
+        transcription = raw_transcription
+    else:
+        # Translation output grows with the input, so chunks are packed by output tokens, not characters
+        chunks = split_transcript(raw_transcription, LONG_INPUT_TRANSLATION_TOKENS, estimate_translation_tokens)
+        logger.info(f"Long input ({len(raw_transcription)} chars): translating {len(chunks)} chunks")
+        transcription = "\n\n".join(await map_chunks(translate_chunk_prompt, chunks, estimate_translation_tokens))
+
+    classification_prompt = f"""You are an elite Chief of Staff. You are analyzing this from a {domain} perspective.
+
+Transcription: \"\"\"
+{transcription}
+\"\"\"
+
+Classify the executive state: Reflective, Decisive, Analytical, Urgent, Strategic, or Operational.
+
+Return ONLY a JSON object (no markdown, no code blocks):
+{{
+  "executive_state": "Reflective"
+}}
+
+Zero chatter. Zero markdown. Pure JSON."""
+
+    parsed_response = clean_and_parse_json(await complete_text(classification_prompt, max_tokens=100))
+    parsed_response["transcription"] = transcription
+    if not english:
+        parsed_response["original_transcription"] = raw_transcription
+    return parsed_response
+
+async def analyze_short_transcription(raw_transcription: str, detected_language: str, domain: str) -> dict:
+    """Single-call analysis: the translation (if any) comes back inline; the original is never echoed."""
+    analysis_prompt = f"""You are an elite Chief of Staff. You are analyzing this from a {domain} perspective. Analyze this transcription.
 
 Transcription: \"\"\"
 {raw_transcription}
@@ -174,33 +708,67 @@ Detected language: {detected_language}
 Return ONLY a JSON object (no markdown, no code blocks):
 {{
   "transcription": "The English version of the transcription (translated if needed, otherwise the original)",
-  "original_transcription": "The original transcription if it was not in English, otherwise omit this field",
   "executive_state": "Reflective"
 }}
 
 Zero chatter. Zero markdown. Pure JSON."""
+    
+    response = await create_message(
+        model=MODEL_ID,
+        max_tokens=4096,
+        messages=[
+            {
+                "role": "user",
+                "content": analysis_prompt
+            }
+        ]
+    )
+    
+    response_text = response.content[0].text
+    parsed_response = clean_and_parse_json(response_text)
+    if not is_english(detected_language):
+        parsed_response["original_transcription"] = raw_transcription
+    return parsed_response
+
+async def analyze_transcription(raw_transcription: str, detected_language: str, domain: str) -> dict:
+    """Claude pass over a finished transcription: translation if needed, executive state, glossary fixes."""
+    started = time.perf_counter()
+    if needs_long_input_mode(raw_transcription, detected_language):
+        parsed_response = await analyze_long_transcription(raw_transcription, detected_language, domain)
+        record_latency("transmute.map_reduce", started)
+    else:
+        parsed_response = await analyze_short_transcription(raw_transcription, detected_language, domain)
+        record_latency("transmute.single_shot", started)
+    
+    # DETECT INDUSTRY & APPLY CORRECTIONS
+    transcription = parsed_response.get("transcription", "")
+    industry = detect_industry(transcription)
+    corrected_transcription = apply_glossary_corrections(transcription, industry)
+    
+    parsed_response["transcription"] = corrected_transcription
+    parsed_response["industry"] = domain
+    return parsed_response
+
+# --- STEP 1: THE SCRIBE (Audio -> Core Thesis) ---
+@app.post("/api/transmute")
+async def transmute_handler(file: UploadFile = File(...), domain: str = Form("General Business"), isPro: bool = Form(False)):
+    UPSTREAM_PRIORITY.set("interactive_pro" if isPro else "interactive_free")
+    try:
+        logger.info(f"Scribe receiving audio: {file.filename}")
         
-        response = client.messages.create(
-            model=MODEL_ID,
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": analysis_prompt
-                }
-            ]
-        )
-        
-        response_text = response.content[0].text
-        parsed_response = clean_and_parse_json(response_text)
+        # 1. READ AUDIO DATA
+        audio_bytes = await file.read()
+        mime_type = file.content_type or "audio/webm"
+        mime_type = mime_type.split(";")[0]
+        file_ext = AUDIO_EXTENSIONS.get(mime_type, "webm")
         
-        # 4. DETECT INDUSTRY & APPLY CORRECTIONS
-        transcription = parsed_response.get("transcription", "")
-        industry = detect_industry(transcription)
-        corrected_transcription = apply_glossary_corrections(transcription, industry)
+        # 2. TRANSCRIBE with OpenAI Whisper
+        logger.info(f"Sending audio to Whisper ({mime_type}, {len(audio_bytes)} bytes)")
+        raw_transcription, detected_language = await run_upstream(get_transcriber(), audio_bytes, file_ext)
+        logger.info(f"Whisper transcription complete. Language: {detected_language}, Length: {len(raw_transcription)} chars")
         
-        parsed_response["transcription"] = corrected_transcription
-        parsed_response["industry"] = domain
+        # 3. ANALYZE with Claude (executive state + translation if needed)
+        parsed_response = await analyze_transcription(raw_transcription, detected_language, domain)
         
         return {"status": "success", "data": parsed_response}
 
@@ -210,6 +778,197 @@ Zero chatter. Zero markdown. Pure JSON."""
         logger.error(f"Scribe Error: {str(e)}\n{error_details}")
         return {"status": "error", "message": str(e), "details": error_details}
 
+# --- STEP 1 (LIVE): Stream audio chunks over WebSocket while the user is still recording ---
+# Segments are cut and sent to the transcriber once this much audio has buffered
+STREAM_SEGMENT_SECONDS = 12
+# Bitrate the recorder is assumed to use when the client does not say (matches AudioRecorder.jsx)
+STREAM_DEFAULT_BITRATE = 16000
+# EBML ID of a WebM Cluster; everything before the first one is the container header
+WEBM_CLUSTER_ID = b"\x1f\x43\xb6\x75"
+WEBM_TIMECODE_ID = 0xE7
+
+def read_vint(data: bytes, pos: int) -> Optional[tuple]:
+    """Reads an EBML variable-length integer at `pos`. Returns (value, length) or None if truncated."""
+    if pos >= len(data) or data[pos] == 0:
+        return None
+    length = 8 - data[pos].bit_length() + 1
+    if pos + length > len(data):
+        return None
+    value = data[pos] & (0xFF >> length)
+    for byte in data[pos + 1:pos + length]:
+        value = (value << 8) | byte
+    return value, length
+
+def cluster_timecode_ms(data: bytes, start: int) -> Optional[int]:
+    """Timecode (ms) of the Cluster whose ID begins at `start`, or None if it cannot be read yet."""
+    size = read_vint(data, start + len(WEBM_CLUSTER_ID))
+    if size is None:
+        return None
+    pos = start + len(WEBM_CLUSTER_ID) + size[1]
+    if pos >= len(data) or data[pos] != WEBM_TIMECODE_ID:
+        return None
+    timecode_size = read_vint(data, pos + 1)
+    if timecode_size is None:
+        return None
+    value_start = pos + 1 + timecode_size[1]
+    value_end = value_start + timecode_size[0]
+    if value_end > len(data):
+        return None
+    return int.from_bytes(data[value_start:value_end], "big")
+
+class StreamingTranscription:
+    """Buffers recorder chunks into segments and transcribes completed segments in the background.
+
+    WebM chunks from MediaRecorder are not decodable on their own, so every segment after the
+    first is cut on a Cluster boundary and prefixed with the container header from the first chunk.
+    Segment length is measured from Cluster timecodes; if those cannot be read, it is estimated
+    from the recorder bitrate. Other containers cannot be split safely and are transcribed as a
+    single segment on stop.
+    """
+
+    def __init__(self, mime_type: str, transcribe, on_partial, priority: str = "interactive_free", bitrate: int = STREAM_DEFAULT_BITRATE):
+        self.file_ext = AUDIO_EXTENSIONS.get(mime_type, "webm")
+        self.segment_bytes = STREAM_SEGMENT_SECONDS * bitrate // 8
+        self.priority = priority
+        self.transcribe = transcribe
+        self.on_partial = on_partial
+        self.header = None
+        self.buffer = bytearray()
+        self.tasks = []
+        self.tickets = []
+        self.texts = {}
+        self.languages = []
+        self.stopped = False
+        self.stop_time = None
+
+    def add_chunk(self, chunk: bytes):
+        if self.stopped:
+            return
+        self.buffer.extend(chunk)
+        if self.header is None:
+            # The header may span several chunks; it is only known once the first Cluster arrives
+            cluster_start = self.buffer.find(WEBM_CLUSTER_ID)
+            if cluster_start < 0:
+                return
+            self.header = bytes(self.buffer[:cluster_start])
+        if self.file_ext == "webm":
+            self.cut_segment()
+
+    def cut_segment(self, final: bool = False):
+        data = bytes(self.buffer)
+        if not final:
+            # Cut on the last Cluster boundary once the buffer spans a full segment;
+            # the tail stays buffered and starts the next segment
+            first = data.find(WEBM_CLUSTER_ID)
+            boundary = data.rfind(WEBM_CLUSTER_ID)
+            if first < 0 or boundary <= first:
+                return
+            start_ms = cluster_timecode_ms(data, first)
+            end_ms = cluster_timecode_ms(data, boundary)
+            if start_ms is not None and end_ms is not None:
+                if end_ms - start_ms < STREAM_SEGMENT_SECONDS * 1000:
+                    return
+            elif boundary < self.segment_bytes:
+                return
+            data = data[:boundary]
+        self.buffer = self.buffer[len(data):]
+        if not data:
+            return
+
+        index = len(self.tasks)
+        audio = data if index == 0 else (self.header or b"") + data
+        self.tasks.append(asyncio.create_task(self._transcribe_segment(index, audio)))
+
+    async def _transcribe_segment(self, index: int, audio: bytes):
+        # Segments cut mid-recording are speculative until the user stops; stop() promotes any still queued
+        ticket = UpstreamTicket(self.priority if self.stopped else "background")
+        self.tickets.append(ticket)
+        started = time.perf_counter()
+        text, language = await run_upstream(self.transcribe, audio, self.file_ext, ticket=ticket)
+        record_latency("stream.segment", started)
+        self.texts[index] = text.strip()
+        self.languages.append(language)
+        await self.on_partial(index, self.texts[index])
+
+    def transcript(self) -> str:
+        """Transcript of the contiguous run of completed segments, in recording order."""
+        parts = []
+        for index in range(len(self.tasks)):
+            if index not in self.texts:
+                break
+            parts.append(self.texts[index])
+        return " ".join(part for part in parts if part)
+
+    def stop(self):
+        """Recording ended: only the final segment is left to transcribe."""
+        if not self.stopped:
+            self.stopped = True
+            self.stop_time = time.perf_counter()
+            for ticket in self.tickets:
+                scheduler.promote(ticket, self.priority)
+            self.cut_segment(final=True)
+
+    async def finish(self) -> tuple:
+        self.stop()
+        await asyncio.gather(*self.tasks)
+        record_latency("stream.after_stop", self.stop_time)
+        increment("stream.segments", len(self.tasks))
+        language = max(set(self.languages), key=self.languages.count) if self.languages else "en"
+        return self.transcript(), language
+
+    def cancel(self):
+        for task in self.tasks:
+            task.cancel()
+
+@app.websocket("/api/transmute/stream")
+async def transmute_stream_handler(websocket: WebSocket, mime: str = "audio/webm", pro: bool = False, bitrate: int = STREAM_DEFAULT_BITRATE):
+    """Protocol: binary messages are recorder chunks; {"type": "stop"} marks the end of recording;
+    {"type": "finalize", "domain": ...} returns the same payload as /api/transmute and closes."""
+    await websocket.accept()
+    UPSTREAM_PRIORITY.set("interactive_pro" if pro else "interactive_free")
+
+    async def send_partial(index: int, text: str):
+        try:
+            await websocket.send_json({"type": "partial", "segment": index, "text": text, "transcript": stream.transcript()})
+        except Exception:
+            pass
+
+    stream = StreamingTranscription(mime.split(";")[0], get_transcriber(), send_partial, UPSTREAM_PRIORITY.get(), bitrate)
+    logger.info(f"Live transcription stream opened ({mime})")
+
+    try:
+        while True:
+            message = await websocket.receive()
+            if message["type"] == "websocket.disconnect":
+                stream.cancel()
+                return
+            if message.get("bytes"):
+                stream.add_chunk(message["bytes"])
+                continue
+
+            control = json.loads(message.get("text") or "{}")
+            if control.get("type") == "stop":
+                stream.stop()
+            elif control.get("type") == "finalize":
+                raw_transcription, detected_language = await stream.finish()
+                logger.info(f"Live transcription complete. Segments: {len(stream.tasks)}, Length: {len(raw_transcription)} chars")
+                domain = control.get("domain") or "General Business"
+                parsed_response = await analyze_transcription(raw_transcription, detected_language, domain)
+                await websocket.send_json({"type": "result", "status": "success", "data": parsed_response})
+                await websocket.close()
+                return
+
+    except WebSocketDisconnect:
+        stream.cancel()
+    except Exception as e:
+        stream.cancel()
+        logger.error(f"Live Scribe Error: {str(e)}")
+        try:
+            await websocket.send_json({"type": "result", "status": "error", "message": str(e)})
+            await websocket.close()
+        except Exception:
+            pass
+
 def clean_and_parse_json(text: str):
     """Robust helper to extract JSON from Claude's response."""
     try:
@@ -253,6 +1012,127 @@ def clean_and_parse_json(text: str):
         logger.error(f"Top-level JSON Parsing Error: {str(e)}")
         raise e
 
+# --- STRUCTURED OUTPUT: Schema-constrained generation with field-level repair ---
+STRUCTURED_TOOL_NAME = "emit_output"
+
+async def generate_structured(prompt: str, schema, max_tokens: int = 4096) -> dict:
+    """Calls Claude in forced tool-use mode so the reply arrives shaped by `schema`."""
+    response = await create_message(
+        model=MODEL_ID,
+        max_tokens=max_tokens,
+        tools=[
+            {
+                "name": STRUCTURED_TOOL_NAME,
+                "description": "Return the structured output for this request.",
+                "input_schema": schema.model_json_schema()
+            }
+        ],
+        tool_choice={"type": "tool", "name": STRUCTURED_TOOL_NAME},
+        messages=[
+            {
+                "role": "user",
+                "content": prompt
+            }
+        ]
+    )
+
+    for block in response.content:
+        if block.type == "tool_use" and isinstance(block.input, dict):
+            return dict(block.input)
+
+    # Model answered in prose despite the forced tool; fall back to text parsing
+    text = "".join(getattr(block, "text", "") for block in response.content)
+    try:
+        parsed = clean_and_parse_json(text)
+    except ValueError:
+        return {}
+    return parsed if isinstance(parsed, dict) else {}
+
+def invalid_fields(error: ValidationError) -> dict:
+    """Maps each invalid top-level field to its failing list item indices, or None to regenerate the whole field."""
+    fields = {}
+    for err in error.errors():
+        loc = err["loc"]
+        if not loc:
+            continue
+        name = loc[0]
+        if len(loc) > 1 and isinstance(loc[1], int):
+            indices = fields.setdefault(name, [])
+            if indices is not None and loc[1] not in indices:
+                indices.append(loc[1])
+        else:
+            fields[name] = None
+    return fields
+
+async def repair_fields(prompt: str, schema, content: dict, fields: dict) -> dict:
+    """Re-requests only the invalid fields (or list items), using the valid part of `content` as context."""
+    definitions, wanted = {}, []
+    for name, indices in fields.items():
+        field = schema.model_fields[name]
+        if indices is None:
+            definitions[name] = (field.annotation, field)
+            wanted.append(name)
+        else:
+            definitions[name] = (
+                List[get_args(field.annotation)[0]],
+                Field(min_length=len(indices), max_length=len(indices), description=f"Replacements for the items at positions {indices}, in that order")
+            )
+            wanted.append(f"{name} items at positions {', '.join(str(index) for index in indices)}")
+    partial_schema = create_model(f"{schema.__name__}Repair", **definitions)
+    draft = {key: value for key, value in content.items() if key in schema.model_fields and fields.get(key, []) is not None}
+
+    repair_prompt = f"""{prompt}
+
+            A previous draft of this output is below. These were missing or invalid: {"; ".join(wanted)} (positions are 0-based).
+            Produce ONLY replacements for those, consistent with the rest of the draft. Do not rewrite anything else.
+
+            Draft: {json.dumps(draft, ensure_ascii=False)}
+            """
+
+    patch = await generate_structured(repair_prompt, partial_schema)
+
+    repaired = {}
+    for name, indices in fields.items():
+        if name not in patch:
+            continue
+        if indices is None:
+            repaired[name] = patch[name]
+        elif isinstance(patch[name], list):
+            # Splice replacements back by index so the valid items are kept as they were
+            items = list(content[name])
+            for index, item in zip(indices, patch[name]):
+                items[index] = item
+            repaired[name] = items
+    return repaired
+
+async def generate_validated(prompt: str, schema) -> dict:
+    """Generates against `schema`, repairing invalid fields in place instead of regenerating everything."""
+    increment("generation.requests")
+    started = time.perf_counter()
+    content = await generate_structured(prompt, schema)
+    record_latency("generation.initial", started)
+
+    repaired = False
+    for attempt in range(MAX_REPAIR_ATTEMPTS + 1):
+        try:
+            validated = schema.model_validate(content)
+        except ValidationError as e:
+            fields = invalid_fields(e)
+            if attempt == MAX_REPAIR_ATTEMPTS:
+                increment("generation.repair_failed")
+                raise ValueError(f"Generated output still invalid after {MAX_REPAIR_ATTEMPTS} repair attempts: {', '.join(fields)}")
+
+            logger.warning(f"{schema.__name__} failed validation on fields {fields}; requesting targeted repair")
+            started = time.perf_counter()
+            content = {**content, **(await repair_fields(prompt, schema, content, fields))}
+            record_latency("generation.repair", started)
+            increment("generation.repair_calls")
+            repaired = True
+            continue
+
+        increment("generation.repaired" if repaired else "generation.valid_first_pass")
+        return validated.model_dump()
+
 # --- STEP 2: POST GENERATION (Transcribed Text -> Formatted Content) ---
 @app.post("/api/generate-post")
 async def generate_post_handler(request: GenerateRequest):
@@ -262,6 +1142,16 @@ async def generate_post_handler(request: GenerateRequest):
         if request.mode == "strategist" and not request.isPro:
             raise HTTPException(status_code=403, detail="Strategist mode requires a Pro subscription.")
 
+        if request.background:
+            UPSTREAM_PRIORITY.set("background")
+        else:
+            UPSTREAM_PRIORITY.set("interactive_pro" if request.isPro else "interactive_free")
+
+        started = time.perf_counter()
+        long_input = needs_long_input_mode(request.text)
+        # Long transcripts are condensed chunk-by-chunk first; synthesis then runs over the notes
+        source_text = await condense_long_input(request.text) if long_input else request.text
+
         industry_context = f"You are analyzing this from a {request.industry or 'General Business'} perspective."
 
         emphasis_context = ""
@@ -280,7 +1170,7 @@ async def generate_post_handler(request: GenerateRequest):
             if request.structure_mode == "Brief":
                 structure_instruction = "You must provide a BRIEF output. Omit any tactical steps or operational details."
                 json_structure = """
-            Return ONLY a JSON object (no markdown, no code blocks) with:
+            Return your output through the structured output tool with:
             - core_thesis: 30-60 word strategic thesis statement
             - strategic_pillars: array of objects with "title", "description" (1-2 sentences of COS analysis), "is_expanded" (boolean, true if developed beyond what was explicitly stated in the input), "has_statistics" (boolean, true if contains any specific numbers, figures, or statistics)
             - has_numerical_claims: boolean (true if the entire output contains any statistics, figures, or numbers)
@@ -288,7 +1178,7 @@ async def generate_post_handler(request: GenerateRequest):
             else:
                 structure_instruction = "You must provide a DETAILED output including tactical steps."
                 json_structure = """
-            Return ONLY a JSON object (no markdown, no code blocks) with:
+            Return your output through the structured output tool with:
             - core_thesis: 30-60 word strategic thesis statement
             - strategic_pillars: array of objects with "title", "description" (1-2 sentences of COS analysis), "is_expanded" (boolean, true if developed beyond what was explicitly stated), "has_statistics" (boolean, true if contains numbers, figures, or stats)
             - tactical_steps: array of actionable strings
@@ -309,7 +1199,7 @@ async def generate_post_handler(request: GenerateRequest):
 
             Write like history is watching.
             
-            Text: {request.text}
+            Text: {source_text}
             
             {structure_instruction}
             {json_structure}
@@ -318,14 +1208,14 @@ async def generate_post_handler(request: GenerateRequest):
             if request.structure_mode == "Brief":
                 structure_instruction = "You must provide a BRIEF output. Omit any risk audits or email drafts."
                 json_structure = """
-            Return ONLY a JSON object (no markdown, no code blocks) with:
+            Return your output through the structured output tool with:
             - judgment: 150-250 words of deep strategic judgment
             - has_numerical_claims: boolean (true if the entire output contains any statistics, figures, or numbers)
                 """
             else:
                 structure_instruction = "You must provide a DETAILED output including risk audits and email drafts."
                 json_structure = """
-            Return ONLY a JSON object (no markdown, no code blocks) with:
+            Return your output through the structured output tool with:
             - judgment: 150-250 words of deep strategic judgment
             - riskAudit: 150-250 words of risk analysis
             - emailDraft: A ready-to-send draft starting with 'SUBJECT: '
@@ -344,7 +1234,7 @@ async def generate_post_handler(request: GenerateRequest):
 
             Transform user's voice notes into Chief of Staff-level intelligence: clear judgments, precise risk audits, and executive-ready communications. Think like you're briefing the President.
             
-            Text: {request.text}
+            Text: {source_text}
             
             {structure_instruction}
             {json_structure}
@@ -352,22 +1242,10 @@ async def generate_post_handler(request: GenerateRequest):
         
         logger.info(f"Triggering Claude for mode: {request.mode}")
 
-        # Generate with Anthropic Claude
-        response = client.messages.create(
-            model=MODEL_ID,
-            max_tokens=4096,
-            messages=[
-                {
-                    "role": "user",
-                    "content": prompt
-                }
-            ]
-        )
-        
-        response_text = response.content[0].text
-        
-        # Parse result
-        parsed_content = clean_and_parse_json(response_text)
+        # Generate with Anthropic Claude against the response schema, repairing only invalid fields
+        schema = RESPONSE_SCHEMAS[(request.mode, request.structure_mode)]
+        parsed_content = await generate_validated(prompt, schema)
+        record_latency("generate.map_reduce" if long_input else "generate.single_shot", started)
         
         return {
             "status": "success", 
@@ -1,7 +1,7 @@
 import React, { useState, useRef, useEffect } from 'react';
 import { motion } from 'framer-motion';
 import { getUsageCount, incrementUsageCount, hasReachedLimit, getDailyLimitMessage, LIMIT } from '../utils/usageTracker';
-import { transmuteAudio, saveDraft, generateTitle } from '../services/gemini';
+import { transmuteAudio, openTranscriptionStream, saveDraft, generateTitle } from '../services/gemini';
 import { extractHighEmphasisSignals } from '../utils/textAnalysis';
 import PaywallModal from './PaywallModal';
 import { trackEvent, GA_EVENTS } from '../utils/analytics';
@@ -38,6 +38,8 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
     // Short Recording Intercept (Feature 1)
     const [showShortIntercept, setShowShortIntercept] = useState(false);
     const [shortInterceptAccepted, setShortInterceptAccepted] = useState(false);
+    // Live transcription while recording
+    const [liveTranscript, setLiveTranscript] = useState("");
 
     const inputRef = useRef(null);
     const mediaRecorderRef = useRef(null);
@@ -46,8 +48,10 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
     const audioContextRef = useRef(null);
     const analyserRef = useRef(null);
     const qualityCheckRef = useRef(null);
+    const transcriptionStreamRef = useRef(null);
 
     const MAX_FILE_SIZE = 25 * 1024 * 1024;
+    const RECORDING_BITRATE = 16000;
     const ACCEPTED_FORMATS = ['audio/mpeg', 'audio/wav', 'audio/mp4', 'audio/x-m4a', 'audio/webm', 'audio/ogg'];
 
     // 3-stage loading messages (Improvement 4)
@@ -284,6 +288,11 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
         };
     }, [filePreviewUrl]);
 
+    // Drop any open live transcription stream on unmount
+    useEffect(() => {
+        return () => transcriptionStreamRef.current?.close();
+    }, []);
+
     const handleFileChange = (e) => {
         if (e.target.files && e.target.files[0]) processFile(e.target.files[0]);
     };
@@ -309,22 +318,33 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
             const stream = await navigator.mediaDevices.getUserMedia({ audio: true });
             mediaRecorderRef.current = new MediaRecorder(stream, {
                 mimeType: 'audio/webm;codecs=opus',
-                audioBitsPerSecond: 16000
+                audioBitsPerSecond: RECORDING_BITRATE
             });
             audioChunksRef.current = [];
 
+            // Stream chunks to the server so transcription runs while the user is still talking
+            closeTranscriptionStream();
+            setLiveTranscript("");
+            try {
+                transcriptionStreamRef.current = openTranscriptionStream('audio/webm', RECORDING_BITRATE, setLiveTranscript, isProActive);
+            } catch (streamErr) {
+                console.warn('Live transcription unavailable, falling back to upload:', streamErr);
+            }
+
             mediaRecorderRef.current.ondataavailable = (e) => {
                 audioChunksRef.current.push(e.data);
+                if (e.data.size > 0) transcriptionStreamRef.current?.sendChunk(e.data);
             };
 
             mediaRecorderRef.current.onstop = () => {
                 const blob = new Blob(audioChunksRef.current, { type: 'audio/webm' });
+                transcriptionStreamRef.current?.stop();
                 setAudioBlob(blob);
                 setFile(null);
                 stream.getTracks().forEach(track => track.stop());
             };
 
-            mediaRecorderRef.current.start();
+            mediaRecorderRef.current.start(1000);
             setIsRecording(true);
             setRecordingTime(0);
             trackEvent(GA_EVENTS.RECORDING_START);
@@ -349,7 +369,14 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
         }
     };
 
+    const closeTranscriptionStream = () => {
+        transcriptionStreamRef.current?.close();
+        transcriptionStreamRef.current = null;
+    };
+
     const discardRecording = () => {
+        closeTranscriptionStream();
+        setLiveTranscript("");
         setAudioBlob(null);
         setRecordingTime(0);
         setError(null);
@@ -389,7 +416,20 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
         try {
             const finalDomain = domainInput.trim() || "General Business";
             saveDomainToMemory(finalDomain);
-            const response = await transmuteAudio(audioData, languageName, finalDomain);
+            let response = null;
+            const liveStream = audioBlob ? transcriptionStreamRef.current : null;
+            transcriptionStreamRef.current = null;
+            if (liveStream) {
+                try {
+                    response = await liveStream.finalize(finalDomain);
+                } catch (streamErr) {
+                    console.warn('Live transcription failed, uploading full recording:', streamErr);
+                    liveStream.close();
+                }
+            }
+            if (!response || response.status === 'error') {
+                response = await transmuteAudio(audioData, languageName, finalDomain, isProActive);
+            }
 
             if (response.status === 'error') {
                 throw new Error(response.message || "The transmutation was interrupted. Let's try that again.");
@@ -635,6 +675,11 @@ const AudioRecorder = ({ onUploadSuccess, t, languageName, isPro, initialAudio }
                                     <p className="text-[#F9F7F5] text-2xl font-light tracking-wider">{formatTime(recordingTime)}</p>
                                     <p className="text-[#999] text-xs">{t.messages.tap_finish}</p>
                                 </div>
+                                {liveTranscript && (
+                                    <p className="text-[#cccccc] text-xs font-light italic text-center max-w-sm line-clamp-3">
+                                        {liveTranscript}
+                                    </p>
+                                )}
                                 {/* Audio Quality Indicator (Layer 3 - Limitation Transparency) */}
                                 {audioQualityIssue && (
                                     <motion.div
@@ -30,11 +30,12 @@ const cleanAndParseJSON = (text) => {
     }
 };
 
-export const transmuteAudio = async (audioBlob, language, domain) => {
+export const transmuteAudio = async (audioBlob, language, domain, isPro = false) => {
     const formData = new FormData();
     formData.append('file', audioBlob, 'recording.webm');
     if (language) formData.append('language', language);
     if (domain) formData.append('domain', domain);
+    formData.append('isPro', isPro ? 'true' : 'false');
 
     try {
         const response = await axios.post(`${API_BASE_URL}/transmute`, formData, {
@@ -49,6 +50,48 @@ export const transmuteAudio = async (audioBlob, language, domain) => {
     }
 };
 
+/**
+ * Opens a live transcription stream. Chunks are transcribed on the server while recording
+ * continues; finalize() resolves with the same { status, data } payload as transmuteAudio.
+ */
+export const openTranscriptionStream = (mimeType, bitrate, onPartial, isPro = false) => {
+    const protocol = window.location.protocol === 'https:' ? 'wss' : 'ws';
+    const socket = new WebSocket(`${protocol}://${window.location.host}${API_BASE_URL}/transmute/stream?mime=${encodeURIComponent(mimeType)}&bitrate=${bitrate}&pro=${isPro ? 'true' : 'false'}`);
+    const pending = []; // messages queued before the socket opened
+
+    let settled = false;
+    let resolveResult, rejectResult;
+    const result = new Promise((resolve, reject) => {
+        resolveResult = (value) => { settled = true; resolve(value); };
+        rejectResult = (error) => { if (!settled) { settled = true; reject(error); } };
+    });
+    result.catch(() => {}); // callers that never finalize should not see an unhandled rejection
+
+    const send = (message) => {
+        if (socket.readyState === WebSocket.OPEN) socket.send(message);
+        else if (socket.readyState === WebSocket.CONNECTING) pending.push(message);
+    };
+
+    socket.onopen = () => pending.splice(0).forEach(message => socket.send(message));
+    socket.onmessage = (event) => {
+        const message = JSON.parse(event.data);
+        if (message.type === 'partial' && onPartial) onPartial(message.transcript);
+        if (message.type === 'result') resolveResult(message);
+    };
+    socket.onerror = () => rejectResult(new Error("Live transcription stream failed."));
+    socket.onclose = () => rejectResult(new Error("Live transcription stream closed before a result."));
+
+    return {
+        sendChunk: (blob) => send(blob),
+        stop: () => send(JSON.stringify({ type: 'stop' })),
+        finalize: (domain) => {
+            send(JSON.stringify({ type: 'finalize', domain }));
+            return result;
+        },
+        close: () => socket.close()
+    };
+};
+
 export const generateTitle = async (transcript) => {
     try {
         const response = await fetch(`${API_BASE_URL}/generate-title`, {